@@ -29,6 +29,189 @@ def load_and_trim_data(filepath, border_percentage=0.10):
     
     return df_trimmed
 
+# Parâmetros da análise de razão de material (curva de Abbott-Firestone)
+LARGURA_BIN_UM = 0.001      # Largura fixa dos bins do histograma de alturas (µm)
+PONTOS_CURVA = 10001        # Resolução da curva de razão de material (passo de 0.01%)
+SMR_C_ABAIXO_PICO_UM = 1.0  # Smr(c) avaliado 1 µm abaixo do pico mais alto
+SMC_P = 0.10                # Smc(p) avaliado em p = 10%
+VMP_P = 0.10                # Vmp avaliado em p = 10%
+VVV_P = 0.80                # Vvv avaliado em p = 80%
+
+def criar_histograma(largura_bin=LARGURA_BIN_UM):
+    """
+    Cria um histograma de alturas vazio com bins de largura fixa ancorados em zero.
+    Como a grade de bins é a mesma para qualquer bloco de dados, histogramas
+    de blocos ou processos diferentes podem ser mesclados sem coordenação prévia.
+    """
+    return {
+        'largura': largura_bin,
+        'inicio': 0,  # Índice global do primeiro bin armazenado
+        'contagens': np.zeros(0, dtype=np.int64),
+        'n': 0,
+        'min': np.inf,
+        'max': -np.inf
+    }
+
+def _expandir_histograma(hist, inicio, fim):
+    """
+    Garante que o histograma cubra os bins globais [inicio, fim).
+    """
+    tamanho = hist['contagens'].size
+    if tamanho == 0:
+        hist['inicio'] = inicio
+        hist['contagens'] = np.zeros(fim - inicio, dtype=np.int64)
+        return
+
+    novo_inicio = min(hist['inicio'], inicio)
+    novo_fim = max(hist['inicio'] + tamanho, fim)
+    if novo_inicio == hist['inicio'] and novo_fim == hist['inicio'] + tamanho:
+        return
+
+    novas_contagens = np.zeros(novo_fim - novo_inicio, dtype=np.int64)
+    deslocamento = hist['inicio'] - novo_inicio
+    novas_contagens[deslocamento:deslocamento + tamanho] = hist['contagens']
+    hist['inicio'] = novo_inicio
+    hist['contagens'] = novas_contagens
+
+def adicionar_ao_histograma(hist, valores):
+    """
+    Acumula um bloco de alturas (resíduos) no histograma.
+    """
+    valores = np.asarray(valores, dtype=float).ravel()
+    if valores.size == 0:
+        return hist
+
+    indices = np.floor(valores / hist['largura']).astype(np.int64)
+    _expandir_histograma(hist, int(indices.min()), int(indices.max()) + 1)
+    hist['contagens'] += np.bincount(indices - hist['inicio'], minlength=hist['contagens'].size)
+
+    hist['n'] += valores.size
+    hist['min'] = min(hist['min'], valores.min())
+    hist['max'] = max(hist['max'], valores.max())
+    return hist
+
+def mesclar_histogramas(hist_a, hist_b):
+    """
+    Combina dois histogramas (de blocos ou processos diferentes) em um novo.
+    """
+    if hist_a['largura'] != hist_b['largura']:
+        raise ValueError("Os histogramas devem ter a mesma largura de bin para serem mesclados.")
+
+    resultado = criar_histograma(hist_a['largura'])
+    for hist in (hist_a, hist_b):
+        tamanho = hist['contagens'].size
+        if tamanho == 0:
+            continue
+        _expandir_histograma(resultado, hist['inicio'], hist['inicio'] + tamanho)
+        deslocamento = hist['inicio'] - resultado['inicio']
+        resultado['contagens'][deslocamento:deslocamento + tamanho] += hist['contagens']
+        resultado['n'] += hist['n']
+        resultado['min'] = min(resultado['min'], hist['min'])
+        resultado['max'] = max(resultado['max'], hist['max'])
+    return resultado
+
+def _bordas_histograma(hist):
+    """
+    Retorna as bordas dos bins em ordem crescente, ajustadas aos extremos exatos.
+    """
+    bordas = (hist['inicio'] + np.arange(hist['contagens'].size + 1)) * hist['largura']
+    bordas[0] = hist['min']
+    bordas[-1] = hist['max']
+    return bordas
+
+def razao_material(hist, c):
+    """
+    Fração dos pontos com altura maior ou igual a c, com interpolação linear
+    dentro do bin que contém c.
+    """
+    bordas = _bordas_histograma(hist)
+    fracao_acima = 1.0 - np.concatenate(([0], np.cumsum(hist['contagens']))) / hist['n']
+    return float(np.interp(c, bordas, fracao_acima, left=1.0, right=0.0))
+
+def curva_razao_material(hist, pontos=PONTOS_CURVA):
+    """
+    Calcula a curva de razão de material (Abbott-Firestone) a partir do histograma.
+    Retorna (mr, alturas), com mr de 0 a 1 e alturas decrescentes.
+
+    Os pontos são considerados uniformemente distribuídos dentro de cada bin, de modo
+    que cada altura da curva difere da obtida ordenando todos os resíduos em no
+    máximo uma largura de bin.
+    """
+    bordas = _bordas_histograma(hist)[::-1]
+    mr_bordas = np.concatenate(([0], np.cumsum(hist['contagens'][::-1]))) / hist['n']
+
+    mr = np.linspace(0.0, 1.0, pontos)
+    alturas = np.interp(mr, mr_bordas, bordas)
+    return mr, alturas
+
+def _integrar(y, x):
+    """
+    Integração pela regra dos trapézios.
+    """
+    return np.sum((y[1:] + y[:-1]) * np.diff(x)) / 2.0
+
+def calcular_parametros_sk(mr, alturas):
+    """
+    Calcula Sk, Spk, Svk, Smr1 e Smr2 (ISO 25178-2 / ISO 13565-2) a partir da
+    curva de razão de material.
+    """
+    # Linha de equivalência: secante de 40% de largura com a menor inclinação
+    janela = int(round(0.4 / (mr[1] - mr[0])))
+    quedas = alturas[:-janela] - alturas[janela:]
+    i = np.argmin(quedas)
+    inclinacao = (alturas[i + janela] - alturas[i]) / (mr[i + janela] - mr[i])
+
+    # Interseções da linha de equivalência com mr = 0% e mr = 100%
+    c1 = alturas[i] - inclinacao * mr[i]
+    c2 = c1 + inclinacao
+    Sk = c1 - c2
+
+    # Razões de material nas interseções (a curva é decrescente)
+    Smr1 = np.interp(c1, alturas[::-1], mr[::-1])
+    Smr2 = np.interp(c2, alturas[::-1], mr[::-1])
+
+    # Spk e Svk: alturas dos triângulos com a mesma área dos picos e vales
+    area_picos = _integrar(np.clip(alturas - c1, 0, None), mr)
+    area_vales = _integrar(np.clip(c2 - alturas, 0, None), mr)
+    Spk = 2 * area_picos / Smr1 if Smr1 > 0 else 0.0
+    Svk = 2 * area_vales / (1 - Smr2) if Smr2 < 1 else 0.0
+
+    return Sk, Spk, Svk, Smr1, Smr2
+
+def calcular_parametros_material(hist):
+    """
+    Calcula os parâmetros da curva de razão de material a partir de um histograma
+    de resíduos. Os erros em relação ao cálculo exato com todos os resíduos
+    ordenados são da ordem da largura do bin.
+    """
+    if hist['n'] == 0:
+        return None
+
+    mr, alturas = curva_razao_material(hist)
+    Sk, Spk, Svk, Smr1, Smr2 = calcular_parametros_sk(mr, alturas)
+
+    # Smr(c) e Smc(p)
+    Smr = razao_material(hist, hist['max'] - SMR_C_ABAIXO_PICO_UM)
+    Smc = np.interp(SMC_P, mr, alturas)
+
+    # Volume de material dos picos (Vmp) e volume de vazios dos vales (Vvv)
+    altura_vmp = np.interp(VMP_P, mr, alturas)
+    altura_vvv = np.interp(VVV_P, mr, alturas)
+    Vmp = _integrar(np.clip(alturas - altura_vmp, 0, None), mr)
+    Vvv = _integrar(np.clip(altura_vvv - alturas, 0, None), mr)
+
+    return {
+        'Smr (%)': Smr * 100,
+        'Smc (µm)': Smc,
+        'Sk (µm)': Sk,
+        'Spk (µm)': Spk,
+        'Svk (µm)': Svk,
+        'Smr1 (%)': Smr1 * 100,
+        'Smr2 (%)': Smr2 * 100,
+        'Vmp (µm³/µm²)': Vmp,
+        'Vvv (µm³/µm²)': Vvv
+    }
+
 def calculate_surface_parameters(df):
     """
     Calcula os parâmetros de rugosidade 3D de um DataFrame de pontos (x, y, z).
@@ -58,7 +241,7 @@ def calculate_surface_parameters(df):
     Ssk = skew(residuals)
     Sku = kurtosis(residuals, fisher=False) # Kurtosis padrão (não excesso)
 
-    return {
+    params = {
         'Sa (µm)': Sa,
         'Sq (µm)': Sq,
         'Sz (µm)': Sz,
@@ -66,6 +249,12 @@ def calculate_surface_parameters(df):
         'Sku': Sku
     }
 
+    # Parâmetros da curva de razão de material (via histograma dos resíduos)
+    hist = adicionar_ao_histograma(criar_histograma(), residuals)
+    params.update(calcular_parametros_material(hist))
+
+    return params
+
 def main():
     """
     Função principal para orquestrar a análise comparativa.
@@ -117,6 +306,11 @@ def main():
     print("\n--- Tabela de Resultados Comparativos ---")
     print(df_results.to_string(float_format="%.4f"))
 
+    # Salva a tabela de resultados em CSV
+    results_path = os.path.join(folder_path, 'resultado.csv')
+    df_results.to_csv(results_path, float_format="%.4f")
+    print(f"\nResultados salvos em '{results_path}'")
+
     # Gera e salva os gráficos comparativos
     print("\nGerando gráficos comparativos...")
     try: